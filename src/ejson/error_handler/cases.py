@@ -1,56 +1,60 @@
 import logging
-from typing import Optional
+from typing import Final
 
-from empire_commons.types_ import NULL
+from empire_commons.types_ import NULL, JsonType
 
-from ejson.error_handler.evaluators import (
-    there_are_double_double_quotes, there_are_keys_non_double_quoted,
-    there_are_non_escaped_double_quotes, there_string_values_single_quoted)
-from ejson.error_handler.fixers import (fix_double_double_quotes,
+from ejson.error_handler.fixers import (fix_all_known_errors,
+                                        fix_double_double_quotes,
                                         fix_non_double_quoted_strings,
                                         fix_non_escaped_double_quotes,
                                         fix_string_values_single_quoted,
                                         fix_unescaped_control_characters,
-                                        try_fix, try_parse_repr_json)
+                                        try_fix, try_fix_if_needed,
+                                        try_parse_repr_json)
+from ejson.error_handler.handled_json_error import HandledJSONError
 from ejson.error_handler.util import get_offset_from_error_string
 
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
 
-def missing_name_for_object_member(to_decode: str, depth: int) -> str | None:
-    logging.info("Unable to decode JSON string: Missing a name for object member (it cannot interpret a key)")
+
+def missing_name_for_object_member(to_decode: str, depth: int) -> JsonType | HandledJSONError | None:
+    _LOGGER.info("Unable to decode JSON string: Missing a name for object member (it cannot interpret a key)")
     attempt = try_parse_repr_json(to_decode)
-    if attempt != NULL:
+    if attempt is not NULL:
         return attempt
 
-    if there_are_keys_non_double_quoted(to_decode):
-        return try_fix(
-            "There are keys that are not surrounded by double quotes, attempting to fix...",
-            fix_non_double_quoted_strings,
-            to_decode,
-            depth,
-        )
+    attempt = try_fix_if_needed(
+        "There are keys that are not surrounded by double quotes, attempting to fix...",
+        fix_non_double_quoted_strings,
+        to_decode,
+        depth,
+    )
+    if attempt is not NULL:
+        return attempt
 
     return None
 
 
-def invalid_value(to_decode: str, depth: int) -> str | None:
-    logging.info("Unable to decode JSON string: Invalid value (it cannot interpret a value)")
+def invalid_value(to_decode: str, depth: int) -> JsonType | HandledJSONError | None:
+    _LOGGER.info("Unable to decode JSON string: Invalid value (it cannot interpret a value)")
     attempt = try_parse_repr_json(to_decode)
-    if attempt != NULL:
+    if attempt is not NULL:
         return attempt
 
-    if there_string_values_single_quoted(to_decode):
-        return try_fix(
-            "There are string values that are surrounded by single quotes (should be double quotes)",
-            fix_string_values_single_quoted,
-            to_decode,
-            depth,
-        )
+    attempt = try_fix_if_needed(
+        "There are string values that are surrounded by single quotes (should be double quotes)",
+        fix_string_values_single_quoted,
+        to_decode,
+        depth,
+    )
+    if attempt is not NULL:
+        return attempt
 
     return None
 
 
-def unexpected_control_character_in_string(to_decode: str, depth: int) -> Optional[str]:
-    logging.info('Probably from ORJSON only: "unexpected control character in string". This can be a \\n or stuff like that')
+def unexpected_control_character_in_string(to_decode: str, depth: int) -> JsonType | HandledJSONError | None:
+    _LOGGER.info('Probably from ORJSON only: "unexpected control character in string". This can be a \\n or stuff like that')
     return try_fix(
         "Attempting to fix by escaping all control characters",
         fix_unescaped_control_characters,
@@ -59,21 +63,38 @@ def unexpected_control_character_in_string(to_decode: str, depth: int) -> Option
     )
 
 
-def missing_comma_or_curly_bracket_after_object_member(to_decode, depth: int) -> str | None:
-    logging.info("Unable to decode JSON string: Missing a comma or '}' after an object member (probably a non-escaped double quote in a value)")
-    if there_are_double_double_quotes(to_decode):
-        return try_fix(
-            'There are consecutive double quotes ("")',
-            fix_double_double_quotes,
-            to_decode,
-            depth,
-        )
-    if there_are_non_escaped_double_quotes(to_decode):
-        return try_fix(
-            "There are non escaped double quotes",
-            fix_non_escaped_double_quotes,
-            to_decode,
-            depth,
-        )
+def missing_comma_or_curly_bracket_after_object_member(to_decode, depth: int) -> JsonType | HandledJSONError | None:
+    _LOGGER.info("Unable to decode JSON string: Missing a comma or '}' after an object member (probably a non-escaped double quote in a value)")
+    attempt = try_fix_if_needed(
+        'There are consecutive double quotes ("")',
+        fix_double_double_quotes,
+        to_decode,
+        depth,
+    )
+    if attempt is not NULL:
+        return attempt
+
+    attempt = try_fix_if_needed(
+        "There are non escaped double quotes",
+        fix_non_escaped_double_quotes,
+        to_decode,
+        depth,
+    )
+    if attempt is not NULL:
+        return attempt
+
+    return None
+
+
+def all_known_errors(to_decode: str, depth: int) -> JsonType | HandledJSONError | None:
+    _LOGGER.info("Unable to decode JSON string after a single fix: there are probably several kinds of errors")
+    attempt = try_fix_if_needed(
+        "Attempting to fix keys, single quoted values and non escaped double quotes all at once",
+        fix_all_known_errors,
+        to_decode,
+        depth,
+    )
+    if attempt is not NULL:
+        return attempt
 
     return None
@@ -1,29 +1,60 @@
 import ast
 import logging
 from contextlib import suppress
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Final
 
+import orjson
 import rapidjson as json
 from empire_commons.types_ import NULL, JsonType
 
 from ejson.error_handler.handled_json_error import HandledJSONError
-from ejson.error_handler.regexes import (CONTROL_CHARACTERS,
+from ejson.error_handler.regexes import (ANY_FIXABLE_ERROR,
                                          NON_DOUBLE_QUOTED_KEY_REGEX,
-                                         NON_ESCAPED_DOUBLE_QUOTE,
-                                         OFFSET_EXTRACTOR,
+                                         REPR_LITERAL_START,
                                          SINGLE_QUOTED_VALUE_REGEX)
 
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+_SMALL_JSON_LENGTH: Final[int] = 256
+_OTHER, _SEPARATOR, _BLANK = 0, 1, 2  # classes of the characters that may follow a double quote, indexed by code point below
+# Another double quote also closes the string: "x" "y" is a missing comma, not a quote to escape
+_QUOTE_FOLLOWERS: Final[bytes] = bytes(_SEPARATOR if code in b",}]:\"" else _BLANK if code in b" \t\r\n" else _OTHER for code in range(256))
+_CONTROL_CHARACTERS_TABLE: Final[dict[int, str]] = str.maketrans({character: " " for character in "\n\r\t\f\v\a"})
+
+
+def try_fix(attempt_message: str, fix: Callable[[str], str], to_decode: str, depth: int) -> JsonType | HandledJSONError:
+    _LOGGER.info(attempt_message)
+    return _decode_fixed(fix(to_decode))
+
+
+def try_fix_if_needed(attempt_message: str, fix: Callable[[str], str], to_decode: str, depth: int) -> JsonType | HandledJSONError:
+    """
+    Same as :func:`try_fix`, but returns ``NULL`` without decoding anything when *fix* did not change *to_decode*.
+    This relies on *fix* returning the very same object when it has nothing to substitute, as ``re.sub`` and ``str.replace`` do.
+    """
+    fixed: str = fix(to_decode)
+    if fixed is to_decode:
+        return NULL
+
+    _LOGGER.info(attempt_message)
+    return _decode_fixed(fixed)
+
+
+def _decode_fixed(fixed: str) -> JsonType | HandledJSONError:
+    # orjson is the fast path, but only rapidjson's error messages are understood by the error handler's cases, so a failure
+    # costs a second decoding. It is not worth it for small strings, which are decoded by rapidjson straight away.
+    if len(fixed) >= _SMALL_JSON_LENGTH:
+        with suppress(orjson.JSONDecodeError):
+            attempt: Any = orjson.loads(fixed)
+            logging.success("Successfully fixed JSON!")  # pylint: disable=no-member
+            return attempt
 
-def try_fix(attempt_message: str, fix: Callable[[str], str], to_decode: str, depth: int) -> JsonType | tuple[Optional[str], json.JSONDecodeError]:
-    logging.info(attempt_message)
-    fixed: Optional[str] = None
     try:
-        fixed = fix(to_decode)
-        attempt: Any = json.loads(fixed)
-        logging.success("Successfully fixed JSON!")  # pylint: disable=no-member
-        return attempt
+        attempt = json.loads(fixed)
     except json.JSONDecodeError as error:
-        raise HandledJSONError(fixed, error)
+        return HandledJSONError(fixed, error)
+
+    logging.success("Successfully fixed JSON!")  # pylint: disable=no-member
+    return attempt
 
 
 def fix_non_double_quoted_strings(to_decode: str) -> str:
@@ -35,18 +66,79 @@ def fix_string_values_single_quoted(to_decode: str) -> str:
 
 
 def fix_non_escaped_double_quotes(to_decode: str) -> str:
-    return NON_ESCAPED_DOUBLE_QUOTE.sub(r"\1\"\2", to_decode)
+    """
+    Escapes double quotes found inside string values. This is a single left-to-right pass: a non-escaped double quote
+    met while inside a string closes it only when the next non-blank character is a separator (or the end of the string),
+    otherwise it is considered part of the value and gets escaped.
+    """
+    to_escape: list[int] = []
+    in_string: bool = False
+    length: int = len(to_decode)
+
+    index: int = to_decode.find('"')
+    while index >= 0:
+        if not _is_escaped(to_decode, index):
+            if not in_string:
+                in_string = True
+            elif _is_closing_quote(to_decode, index + 1, length):
+                in_string = False
+            else:
+                to_escape.append(index)
+        index = to_decode.find('"', index + 1)
+
+    if not to_escape:
+        return to_decode
+
+    pieces: list[str] = []
+    start: int = 0
+    for index in to_escape:
+        pieces.append(to_decode[start:index])
+        pieces.append("\\")
+        start = index
+    pieces.append(to_decode[start:])
+    return "".join(pieces)
+
+
+def _is_escaped(to_decode: str, index: int) -> bool:
+    backslashes: int = 0
+    while index > 0 and to_decode[index - 1] == "\\":
+        backslashes += 1
+        index -= 1
+    return backslashes % 2 == 1
+
+
+def _is_closing_quote(to_decode: str, index: int, length: int) -> bool:
+    while index < length:
+        code: int = ord(to_decode[index])
+        follower: int = _QUOTE_FOLLOWERS[code] if code < 256 else _OTHER
+        if follower != _BLANK:
+            return follower == _SEPARATOR
+        index += 1
+    return True
+
+
+def fix_all_known_errors(to_decode: str) -> str:
+    """
+    Applies the fixes of :func:`fix_non_double_quoted_strings` and :func:`fix_string_values_single_quoted` in a single
+    regular expression pass over *to_decode*, then :func:`fix_non_escaped_double_quotes` on the result.
+    """
+    return fix_non_escaped_double_quotes(ANY_FIXABLE_ERROR.sub(lambda match: f'"{match[match.lastgroup]}"', to_decode))
 
 
 def fix_double_double_quotes(to_decode: str) -> str:
+    if '""' not in to_decode:
+        return to_decode
     return to_decode.replace('""', '"')
 
 
 def fix_unescaped_control_characters(to_decode: str) -> str:
-    return CONTROL_CHARACTERS.sub(" ", to_decode)
+    return to_decode.translate(_CONTROL_CHARACTERS_TABLE)
 
 
 def try_parse_repr_json(to_decode: str) -> Any:
+    if not REPR_LITERAL_START.match(to_decode):  # not a repr() of a container, a string, a boolean or None: no need to parse anything
+        return NULL
+
     with suppress(Exception):
         attempt: Any = ast.literal_eval(to_decode)
         logging.success("Provided JSON was a repr() string")  # pylint: disable=no-member
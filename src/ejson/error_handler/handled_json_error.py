@@ -1,8 +1,11 @@
-from typing import Any
+from typing import Any, NamedTuple
 
 
-class HandledJSONError(Exception):
-    def __init__(self, fixed: str, error: Any):
-        self.fixed: str = fixed
-        self.error: Any = error
-        super().__init__("HandledJSONError")
+class HandledJSONError(NamedTuple):
+    """
+    Returned by a fix attempt whose result still cannot be decoded: *fixed* is the partially fixed JSON string and
+    *error* the decoding error it produced.
+    """
+
+    fixed: str
+    error: Any
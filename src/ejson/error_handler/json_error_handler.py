@@ -4,55 +4,156 @@ Module that attempts to fix erroneous JSON.
 from __future__ import annotations
 
 import logging
-from typing import Any, Final, Optional
+import re
+import sys
+import threading
+from typing import Any, Callable, Final, Optional
 
 import rapidjson as json
 from empire_commons.types_ import JsonType
 
 from ejson.error_handler.cases import (
-    invalid_value, missing_comma_or_curly_bracket_after_object_member,
+    all_known_errors, invalid_value,
+    missing_comma_or_curly_bracket_after_object_member,
     missing_name_for_object_member, unexpected_control_character_in_string)
 from ejson.error_handler.handled_json_error import HandledJSONError
 from ejson.error_handler.util import get_offset_from_error_string
 
+CaseType = Callable[[str, int], JsonType | HandledJSONError | None]
+
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
 _MAXIMUM_DEPTH: Final[int] = 20
+_MAXIMUM_CACHED_LENGTH: Final[int] = 16 * 1024
+_MAXIMUM_CACHE_CHARACTERS: Final[int] = 1024 * 1024  # across all entries, so at most a few MiB are held
+_CASES: Final[dict[str, CaseType]] = {  # keyed by the part of the decoding error message that identifies each case
+    sys.intern("Missing a name for object member"): missing_name_for_object_member,
+    sys.intern("Invalid value"): invalid_value,
+    sys.intern("Missing a comma or '}' after an object member"): missing_comma_or_curly_bracket_after_object_member,
+    sys.intern("unexpected control character in string"): unexpected_control_character_in_string,
+}
+_CASE_DISPATCHER: Final[re.Pattern] = re.compile("|".join(map(re.escape, _CASES)))
+
+
+class _FixCache:
+    """
+    Maps (JSON string, error message) to the case that fixed it and the string it was given at that point,
+    so a repeated bad JSON only goes through the last fix attempt. Results themselves are not cached as they are mutable.
+
+    Least recently used entries are evicted once the cached strings exceed *maximum_characters* in total.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, maximum_characters: int):
+        self._entries: dict[tuple[str, str], tuple[CaseType, str]] = {}  # least recently used first
+        self._characters: int = 0
+        self._maximum_characters: int = maximum_characters
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> tuple[CaseType, str] | None:
+        with self._lock:
+            if (entry := self._entries.pop(key, None)) is not None:
+                self._entries[key] = entry
+            return entry
+
+    def put(self, key: tuple[str, str], case: CaseType, fixable: str) -> None:
+        if (characters := self._count_characters(key, fixable)) > self._maximum_characters:
+            return
+
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self._characters -= self._count_characters(key, previous[1])
+
+            while self._entries and self._characters + characters > self._maximum_characters:
+                evicted_key: tuple[str, str] = next(iter(self._entries))
+                self._characters -= self._count_characters(evicted_key, self._entries.pop(evicted_key)[1])
+
+            self._entries[key] = (case, fixable)
+            self._characters += characters
+
+    @staticmethod
+    def _count_characters(key: tuple[str, str], fixable: str) -> int:
+        return len(key[0]) + len(key[1]) + len(fixable)
+
+
+_FIX_CACHE: Final[_FixCache] = _FixCache(_MAXIMUM_CACHE_CHARACTERS)
 
 
 # TODO: perform QA of this function
 # TODO: build tests
-def error_handler(to_decode: str, error: json.JSONDecodeError, depth: int = 0) -> JsonType:
+def error_handler(to_decode: str | bytes | bytearray | memoryview, error: json.JSONDecodeError, depth: int = 0) -> JsonType:
     """
     This function attempts to fix erroneous JSON while decoding it, which usually occurs when json.loads() function.
 
-    :param to_decode: The JSON string to parse
+    :param to_decode: The JSON string to parse, UTF-8 encoded bytes-like objects (as accepted by orjson) are decoded once here
     :param error: The exception instance
-    :param depth: You don't have to provide this value, used to avoid infinite recursion
+    :param depth: You don't have to provide this value, used to limit the number of fix attempts
     :return: Always returns the parsed JSON, on error, it simply raise it.
     :raises: Any exception that may occur while parsing the JSON.
     """
-    character_index: Optional[int] = get_offset_from_error_string(str(error))
-    if character_index is not None:
-        character_message: str = f"Problematic character at index {character_index}: {to_decode[character_index - 10:character_index + 10]}"
-        logging.info(character_message)
-        logging.debug((len(character_message) - 10) * "." + "^")
+    prepared: JsonType | HandledJSONError = _as_rapidjson_error(to_decode, error)
+    if not isinstance(prepared, HandledJSONError):
+        return prepared  # rapidjson decoded what the other decoder could not
+    to_decode, error = prepared
 
-    try:
-        if depth < _MAXIMUM_DEPTH:
-            error_string: str = str(error)
-            if "Missing a name for object member" in error_string:
-                return missing_name_for_object_member(to_decode, depth)
-            elif "Invalid value" in error_string:
-                return invalid_value(to_decode, depth)
-            elif "Missing a comma or '}' after an object member" in error_string:
-                return missing_comma_or_curly_bracket_after_object_member(to_decode, depth)
-            elif "unexpected control character in string" in error_string:
-                return unexpected_control_character_in_string(to_decode, depth)
-    except HandledJSONError as e:
-        return error_handler(e.fixed, e.error, depth + 1)
-
-    if depth >= _MAXIMUM_DEPTH:
-        logging.error("Tried to many attempts: %d attempts", depth)
-    else:
-        logging.error("Unable to fix JSON: Unknown error: %s", error)
+    cache_key: Optional[tuple[str, str]] = None
+    if depth == 0 and len(to_decode) <= _MAXIMUM_CACHED_LENGTH:
+        cache_key = (to_decode, str(error))
+        if (cached := _FIX_CACHE.get(cache_key)) is not None:
+            case, fixable = cached
+            return case(fixable, depth)
+
+    tried_all_known_errors: bool = False
+    while depth < _MAXIMUM_DEPTH:
+        error_string: str = str(error)
+        if _LOGGER.isEnabledFor(logging.INFO):
+            character_index: Optional[int] = get_offset_from_error_string(error_string)
+            if character_index is not None:
+                character_message: str = f"Problematic character at index {character_index}: {to_decode[character_index - 10:character_index + 10]}"
+                _LOGGER.info(character_message)
+                _LOGGER.debug((len(character_message) - 10) * "." + "^")
+
+        if not (match := _CASE_DISPATCHER.search(error_string)):
+            _LOGGER.error("Unable to fix JSON: Unknown error: %s", error)
+            raise error
+
+        case: CaseType = _CASES[match.group()]
+        attempt: JsonType | HandledJSONError | None = case(to_decode, depth)
+        if isinstance(attempt, HandledJSONError) and not tried_all_known_errors:
+            # The JSON has more than one error: see if fixing everything at once is enough before going on one fix at a time
+            tried_all_known_errors = True
+            shortcut: JsonType | HandledJSONError | None = all_known_errors(to_decode, depth)
+            if shortcut is not None and not isinstance(shortcut, HandledJSONError):
+                case, attempt = all_known_errors, shortcut
+
+        if not isinstance(attempt, HandledJSONError):
+            if cache_key is not None:
+                _FIX_CACHE.put(cache_key, case, to_decode)
+            return attempt
+
+        to_decode, error = attempt
+        depth += 1
 
+    _LOGGER.error("Tried to many attempts: %d attempts", depth)
     raise error
+
+
+def _as_rapidjson_error(to_decode: str | bytes | bytearray | memoryview, error: Exception) -> JsonType | HandledJSONError:
+    """
+    Decodes a bytes-like *to_decode* to str. When *error* comes from another decoder and is not understood by any case,
+    *to_decode* is decoded again by rapidjson, which either succeeds, giving the parsed JSON, or gives an error the cases understand.
+    """
+    if not isinstance(to_decode, str):
+        try:
+            to_decode = str(to_decode, "utf-8")
+        except UnicodeDecodeError:
+            _LOGGER.error("Unable to fix JSON: it is not valid UTF-8")
+            raise error
+
+    if isinstance(error, json.JSONDecodeError) or _CASE_DISPATCHER.search(str(error)):
+        return HandledJSONError(to_decode, error)
+
+    # Errors from other decoders (e.g. orjson) mostly describe problems differently than the ones cases are keyed by
+    try:
+        return json.loads(to_decode)
+    except json.JSONDecodeError as rapidjson_error:
+        return HandledJSONError(to_decode, rapidjson_error)
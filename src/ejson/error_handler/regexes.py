@@ -1,10 +1,11 @@
 from typing import Final
 
-import regex as re
+import re
 
-OFFSET_EXTRACTOR: Final[re.Pattern] = re.compile(r"offset (\d+):")
-OFFSET_EXTRACTOR_CHAR_VARIANT: Final[re.Pattern] = re.compile(r"\(char (\d+)\)")
-NON_DOUBLE_QUOTED_KEY_REGEX: Final[re.Pattern] = re.compile(r"(?<=[{, ])'?([^'\"]+)'?(?=:[ \"'])")
-SINGLE_QUOTED_VALUE_REGEX: Final[re.Pattern] = re.compile(r"(?<=: |:|\[)'([^']*)'(?=[,} \]])")
-NON_ESCAPED_DOUBLE_QUOTE: Final[re.Pattern] = re.compile(r"(?<=[{: ,])(\"[^'\"]*)\"([^'\"]*\")(?=[,}: ])")
-CONTROL_CHARACTERS: Final[re.Pattern] = re.compile(r"(\n|\r|\t|\f|\v|\a)")
+OFFSET_UNIFIED: Final[re.Pattern] = re.compile(r"offset (\d+):|\(char (\d+)\)")
+# Keys only start right after "{" or ",", so one match at most is attempted between two separators, spaces within keys included
+NON_DOUBLE_QUOTED_KEY_REGEX: Final[re.Pattern] = re.compile(r"(?<=[{,])\s*'?(?P<unquoted_key>[^'\":,{}\s](?:[^'\":,{}]*[^'\":,{}\s])?)'?(?=:[ \"'])")
+SINGLE_QUOTED_VALUE_REGEX: Final[re.Pattern] = re.compile(r"(?:(?<=: )|(?<=[:\[]))'(?P<single_quoted_value>[^'\r\n]*)'(?=[,} \]])")
+REPR_LITERAL_START: Final[re.Pattern] = re.compile(r"\s*(?:[{\[('\"]|True|False|None)")
+# Each branch has a single named group: the text to surround with double quotes
+ANY_FIXABLE_ERROR: Final[re.Pattern] = re.compile(f"{NON_DOUBLE_QUOTED_KEY_REGEX.pattern}|{SINGLE_QUOTED_VALUE_REGEX.pattern}")
@@ -34,11 +34,11 @@ from frozendict import frozendict
 # TODO: check for packaging, requires rust: https://github.com/ijl/orjson#packaging
 
 
-__all__ = ["json", "default_encoder", "dumps", "loads"]
+__all__ = ["json", "build_options", "default_encoder", "dumps", "dumps_bytes", "loads"]
 
 
 def default_encoder(obj: Any) -> JsonType:
-    if obj == NULL:
+    if obj is NULL:
         return "EMPIRE::NULL"
     elif isinstance(obj, (set, frozenset, deque)):
         return list(obj)
@@ -48,7 +48,16 @@ def default_encoder(obj: Any) -> JsonType:
         raise ValueError(f"Cannot serialize {obj}")
 
 
-def dumps(
+def dumps(obj: JsonType, **kwargs) -> str:
+    """
+    Encode given Python obj instance into a JSON string. See :func:`dumps_bytes` for the accepted keyword arguments.
+    :param obj: the value to be serialized
+    :return: A python str instance
+    """
+    return dumps_bytes(obj, **kwargs).decode("utf-8")
+
+
+def dumps_bytes(
     obj: JsonType,
     *,
     default: Optional[Callable[[Any], Any]] = default_encoder,
@@ -65,9 +74,10 @@ def dumps(
     strict_integers: bool = False,
     use_z_for_timezone: bool = False,
     **kwargs,
-) -> str:
+) -> bytes:
     """
-    Encode given Python obj instance into a JSON string.
+    Encode given Python obj instance into UTF-8 encoded JSON, as orjson natively does. Prefer this over :func:`dumps` when
+    the result is written to a binary file or socket, it avoids decoding it.
     :param obj: the value to be serialized
     :param default: To serialize a subclass or arbitrary types, specify default as a callable that returns a supported type. default may be a
     function, lambda, or callable class instance. To specify that a type was not handled by default, raise an exception such as TypeError.
@@ -95,7 +105,46 @@ def dumps(
     :param strict_integers: Enforce 53-bit limit on integers. The limit is otherwise 64 bits, the same as the Python standard library. For more, see
     `https://github.com/ijl/orjson#int`.
     :param use_z_for_timezone: Serialize a UTC timezone on datetime.datetime instances as Z instead of +00:00.
-    :return: A python str instance
+    :return: A python bytes instance
+    """
+    options: int = build_options(
+        allow_non_string_keys=allow_non_string_keys,
+        append_new_line=append_new_line,
+        auto_serialize_dataclasses=auto_serialize_dataclasses,
+        auto_serialize_datetime=auto_serialize_datetime,
+        auto_serialize_subclasses_of_builtins=auto_serialize_subclasses_of_builtins,
+        pretty_print_2_spaces=pretty_print_2_spaces,
+        serialize_datetime_without_microseconds=serialize_datetime_without_microseconds,
+        serialize_datetime_without_tzinfo=serialize_datetime_without_tzinfo,
+        serialize_numpy=serialize_numpy,
+        sort_keys=sort_keys,
+        strict_integers=strict_integers,
+        use_z_for_timezone=use_z_for_timezone,
+    )
+
+    return json.dumps(obj, default=default, option=options)
+
+
+def build_options(
+    *,
+    allow_non_string_keys: bool = False,
+    append_new_line: bool = False,
+    auto_serialize_dataclasses: bool = True,
+    auto_serialize_datetime: bool = True,
+    auto_serialize_subclasses_of_builtins: bool = True,
+    pretty_print_2_spaces: bool = False,
+    serialize_datetime_without_microseconds: bool = False,
+    serialize_datetime_without_tzinfo: bool = False,
+    serialize_numpy: bool = False,
+    sort_keys: bool = False,
+    strict_integers: bool = False,
+    use_z_for_timezone: bool = False,
+    **kwargs,
+) -> int:
+    """
+    Resolves the orjson option bitmask matching the given flags, see :func:`dumps_bytes` for their meaning.
+    Callers serializing many objects with the same flags can resolve it once and call `json.dumps` with it.
+    :return: The option bitmask to pass to `json.dumps`
     """
     options: int = 0
 
@@ -135,8 +184,7 @@ def dumps(
     if use_z_for_timezone:
         options |= json.OPT_UTC_Z
 
-    data: bytes = json.dumps(obj, default=default, option=options)
-    return data.decode("utf-8")
+    return options
 
 
 def loads(
@@ -16,7 +16,7 @@ from empire_commons.types_ import NULL, JsonType
 
 
 def default_encoder(obj: Any) -> JsonType:
-    if obj == NULL:
+    if obj is NULL:
         return "EMPIRE::NULL"
     elif isinstance(obj, datetime):
         return obj.isoformat()
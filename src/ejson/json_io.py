@@ -1,14 +1,35 @@
 from __future__ import annotations
 
+import codecs
 import csv
-from contextlib import ExitStack
-from typing import Any, BinaryIO, Callable, Generator, TextIO
+import io
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from functools import partial
+from itertools import chain, islice
+from typing import Any, BinaryIO, Callable, Final, Generator, Iterable, Iterator, Sequence, TextIO
 
 from empire_commons.on_error import OnError, handle_error
 from empire_commons.types_ import JsonListType, JsonType
 from openpyxl.reader.excel import load_workbook
 
-from ejson.facades.orjson_ import dumps, json, loads
+from ejson.facades.orjson_ import build_options, default_encoder, json, loads
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # optional, only needed to read Excel files with use_calamine
+    CalamineWorkbook = None
+
+_IO_BUFFER_SIZE: Final[int] = 1 << 20  # 1 MiB, the default 8 KiB buffer means far more system calls on large files
+_NDJSON_WRITE_FLUSH_SIZE: Final[int] = 4 << 20  # 4 MiB of serialized records are written at once
+_NDJSON_WRITE_BATCH_LENGTH: Final[int] = 1024  # compact records serialized with a single orjson call
+_PARALLEL_CHUNK_SIZE: Final[int] = 64 << 20  # 64 MiB of ND-JSON lines are parsed by a worker at once
+_EXCEL_BOOLEANS: Final[dict[str, bool]] = {"true": True, "false": False}
+_EXCEL_LARGEST_INTEGER_TEXT: Final[float] = 1e16  # integral numbers from there on are written with an exponent
 
 
 class JSON_IO:
@@ -27,33 +48,96 @@ class JSON_IO:
         :param compact: When false, pretty prints to file
         :param on_error_behavior: Behavior this function should have on error
         :param should_append: When true, appends to file instead of truncating it
-        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps`
+        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps_bytes`
         :return: True on success
         """
-        with open(_file, "a" if should_append else "w", encoding="utf8") as f:
-            return JSON_IO.write_ndjson_to_opened_file(f, json_list, compact=compact, on_error_behavior=on_error_behavior)
+        with open(_file, "ab" if should_append else "wb", buffering=_IO_BUFFER_SIZE) as f:
+            return JSON_IO.write_ndjson_to_opened_file(f, json_list, compact=compact, on_error_behavior=on_error_behavior, **kwargs)
 
     @staticmethod
     def write_ndjson_to_opened_file(
         _file: TextIO | BinaryIO, json_list: JsonListType, *, compact: bool = True, on_error_behavior: OnError = OnError.LOG, **kwargs
     ) -> bool:
         """
-        Write *json_list* to already opened *file_*
+        Write *json_list* to already opened *file_*. Records are serialized and written by batches, a binary file handle
+        avoids decoding them.
         :param _file: The file handle
         :param json_list: The json list
         :param compact: When false, pretty prints to file
         :param on_error_behavior: Behavior this function should have on error
-        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps`
+        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps_bytes`
         :return: True on success
         """
         try:
-            for record in json_list:
-                _file.write(dumps(record, pretty_print_2_spaces=not compact, **kwargs) + "\n")
+            write: Callable[[bytes | bytearray], Any] = JSON_IO._get_bytes_writer(_file)
+            buffer: bytearray = bytearray()
+            # Resolved once rather than by the facade for every record
+            default: Callable[[Any], Any] | None = kwargs.pop("default", default_encoder)
+            options: int = build_options(pretty_print_2_spaces=not compact, **kwargs) & ~json.OPT_APPEND_NEWLINE
+
+            records: Iterator[JsonType] = iter(json_list)
+            if compact:
+                records = JSON_IO._buffer_compact_ndjson_batches(records, buffer, write, default, options)
+
+            options |= json.OPT_APPEND_NEWLINE  # orjson writes the line separator in the same output, no extra concatenation
+            dumps: Callable[..., bytes] = json.dumps  # local lookups are cheaper in the loop
+            for record in records:
+                try:
+                    buffer += dumps(record, default=default, option=options)
+                except json.JSONEncodeError:
+                    write(buffer)  # every record before the failing one is still written
+                    raise
+
+                if len(buffer) >= _NDJSON_WRITE_FLUSH_SIZE:
+                    write(buffer)
+                    buffer.clear()
+
+            if buffer:
+                write(buffer)
             return True
         except Exception as error:
             handle_error(error, on_error_behavior, message=f"An error occurred while writing ndjson data to file {_file}")
             return False
 
+    @staticmethod
+    def _buffer_compact_ndjson_batches(
+        records: Iterator[JsonType], buffer: bytearray, write: Callable[[bytes | bytearray], Any], default: Callable[[Any], Any] | None, options: int
+    ) -> Iterator[JsonType]:
+        """
+        Serializes *records* by batches, with a single orjson call each, as long as the batch's array can safely
+        be turned into ND-JSON. Returns the records that still have to be serialized one by one.
+        """
+        while batch := list(islice(records, _NDJSON_WRITE_BATCH_LENGTH)):
+            if not all(isinstance(record, dict) for record in batch):
+                return chain(batch, records)
+
+            try:
+                serialized: bytes = json.dumps(batch, default=default, option=options)
+            except json.JSONEncodeError:
+                return chain(batch, records)  # serialized one by one, so the records before the failing one are kept
+
+            # Compact objects are always separated by "},{", any other occurrence (nested lists of objects, strings) makes this unsafe
+            if serialized.count(b"},{") != len(batch) - 1:
+                return chain(batch, records)  # such records are likely to be found in the next batches too, stop trying
+
+            buffer += memoryview(serialized.replace(b"},{", b"}\n{"))[1:-1]
+            buffer += b"\n"
+            if len(buffer) >= _NDJSON_WRITE_FLUSH_SIZE:
+                write(buffer)
+                buffer.clear()
+
+        return records
+
+    @staticmethod
+    def _get_bytes_writer(_file: TextIO | BinaryIO) -> Callable[[bytes | bytearray], Any]:
+        # codecs writers take str, even though the "mode" they expose is the one of the binary file they wrap
+        if isinstance(_file, (io.RawIOBase, io.BufferedIOBase)) or (
+            "b" in getattr(_file, "mode", "") and not isinstance(_file, (codecs.StreamWriter, codecs.StreamReaderWriter))
+        ):
+            return _file.write
+
+        return lambda data: _file.write(data.decode("utf-8"))  # text handles and anything not known to be binary get str
+
     @staticmethod
     def write_json_to_file(_file: str, _json: JsonType, *, compact: bool = True, on_error_behavior: OnError = OnError.LOG, **kwargs) -> bool:
         """
@@ -62,12 +146,13 @@ class JSON_IO:
         :param _json: The json
         :param compact: When false, pretty prints to file
         :param on_error_behavior: Behavior this function should have on error
-        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps`
+        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps_bytes`
         :return: True on success
         """
         try:
-            with open(_file, "w", encoding="utf8") as f:
-                f.write(dumps(_json, pretty_print_2_spaces=not compact, **kwargs))
+            with open(_file, "wb", buffering=_IO_BUFFER_SIZE) as f:
+                default: Callable[[Any], Any] | None = kwargs.pop("default", default_encoder)
+                f.write(json.dumps(_json, default=default, option=build_options(pretty_print_2_spaces=not compact, **kwargs)))
             return True
         except Exception as error:
             handle_error(error, on_error_behavior, message=f"An error occurred while writing json data to file {_file}")
@@ -85,7 +170,7 @@ class JSON_IO:
         :param data: The data
         :param compact: When false, pretty prints to file
         :param on_error_behavior: Behavior this function should have on error
-        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps`
+        :param kwargs: Kwargs passed to :func:`ejson.facades.orjson_.dumps_bytes`
         :return: True on success
         """
         if isinstance(data, list):
@@ -93,6 +178,11 @@ class JSON_IO:
 
         return JSON_IO.write_json_to_file(_file, data, compact=compact, on_error_behavior=on_error_behavior)
 
+    @staticmethod
+    def _decoding_error_handler(error_handler: Callable[[str, json.JSONDecodeError], JsonType]) -> Callable[[bytes, json.JSONDecodeError], JsonType]:
+        # Files are read as bytes for orjson, but error handlers are given the str that could not be parsed
+        return lambda data, error: error_handler(str(data, "utf-8"), error)
+
     @staticmethod
     def read_json_from_file(
         _file: str, error_handler: Callable[[str, json.JSONDecodeError], JsonType] | None = None, on_error_behavior: OnError = OnError.LOG
@@ -106,10 +196,11 @@ class JSON_IO:
         :param on_error_behavior: Behavior this function should have on error
         :return: The read and parsed JSON on success, None otherwise
         """
-        with open(_file, encoding="utf8") as f:
+        # Unbuffered: the whole file is read at once with a single pre-sized FileIO.readall, no intermediate buffer
+        with open(_file, "rb", buffering=0) as f:
             try:
-                raw: str = f.read()
-                return loads(raw, error_handler)
+                raw: bytes = f.read()  # orjson decodes UTF-8 itself, no need for a str
+                return loads(raw, None if error_handler is None else JSON_IO._decoding_error_handler(error_handler))
             except Exception as error:
                 handle_error(error, on_error_behavior, message=f"Cannot load JSON from file {_file}")
                 return None
@@ -119,7 +210,8 @@ class JSON_IO:
         _file: str, error_handler: Callable[[str, json.JSONDecodeError], JsonType] | None = None, on_error_behavior: OnError = OnError.LOG
     ) -> JsonListType:
         """
-        Reads ND-JSON from *file*
+        Reads ND-JSON from *file*. The whole file is loaded in memory, see :func:`stream_ndjson_from_file`
+        to process large files one record at a time.
         :param _file: The file
         :param error_handler: When provided, a callable that handles error that
         occurred while parsing the JSON. For example,
@@ -128,29 +220,62 @@ class JSON_IO:
         :return: The read and parsed *JsonList* on success, None otherwise
         """
         ndjson: JsonListType = []
-        with open(_file, encoding="utf8") as f:
-            for index, l in enumerate(f):
+        parse: Callable[[bytes], JsonType] = (
+            loads if error_handler is None else partial(loads, error_handler_=JSON_IO._decoding_error_handler(error_handler))
+        )
+        with open(_file, "rb", buffering=_IO_BUFFER_SIZE) as f:
+            try:
+                # ~1 MiB of lines are split at once in C, rather than producing them one at a time
+                while lines := f.readlines(_IO_BUFFER_SIZE):
+                    ndjson.extend(map(parse, lines))
+            except Exception as error:
+                # records parsed before the error are kept by extend(), so the failing line is the next one
+                handle_error(error, on_error_behavior, message=f"Cannot load JSON at line {len(ndjson)} from file {_file}")
+
+        return ndjson
+
+    @staticmethod
+    def stream_ndjson_from_file(
+        _file: str, error_handler: Callable[[str, json.JSONDecodeError], JsonType] | None = None, on_error_behavior: OnError = OnError.LOG
+    ) -> Generator[JsonType, Any, None]:
+        """
+        A generator yielding every record of ND-JSON *file*, one at a time, so only the current record is held in memory.
+        It stops at the first record that cannot be parsed.
+        :param _file: The file
+        :param error_handler: When provided, a callable that handles error that
+        occurred while parsing the JSON. For example,
+        see :func:`ejson.error_handler.json_error_handler.error_handler`
+        :param on_error_behavior: Behavior this function should have on error
+        :return: Generator of parsed records
+        """
+        parse: Callable[[bytes], JsonType] = (
+            loads if error_handler is None else partial(loads, error_handler_=JSON_IO._decoding_error_handler(error_handler))
+        )
+        with open(_file, "rb", buffering=_IO_BUFFER_SIZE) as f:
+            for line_number, line in enumerate(f):
                 try:
-                    ndjson.append(loads(l, error_handler))
+                    record: JsonType = parse(line)
                 except Exception as error:
-                    handle_error(error, on_error_behavior, message=f"Cannot load JSON at line {index} from file {_file}")
-                    break
+                    handle_error(error, on_error_behavior, message=f"Cannot load JSON at line {line_number} from file {_file}")
+                    return
 
-        return ndjson
+                yield record
 
     @staticmethod
-    def _try_parse_json(data: str, on_error: OnError) -> JsonType | None:
-        if not data or not data.strip():
+    def _try_parse_json(data: str | bytes, on_error: OnError) -> JsonType | None:
+        if not data or data.isspace():  # blank lines are skipped, isspace() does not copy the line like strip() did
             return None
 
         try:
-            return json.loads(data)
+            return json.loads(data)  # orjson itself, not the facade wrapper
         except json.JSONDecodeError as error:
             handle_error(error, on_error, message="Could not parse json from source")
             return None
 
     @staticmethod
-    def yield_json_list_from_file(_file: str, batch_size: int, on_error_behavior: OnError = OnError.LOG) -> Generator[JsonListType, Any, None]:
+    def yield_json_list_from_file(
+        _file: str, batch_size: int, on_error_behavior: OnError = OnError.LOG, workers: int = 1, keys: Iterable[str] | None = None
+    ) -> Generator[JsonListType, Any, None]:
         """
         A generator yielding *JsonList* objects from ND-JSON *file_*.
 
@@ -159,18 +284,29 @@ class JSON_IO:
         :param _file: The ND-JSON file
         :param batch_size: The maximum size each list should be
         :param on_error_behavior: Behavior this function should have on error
+        :param workers: When greater than 1, the file is split in chunks of about 64 MiB
+            parsed by that many processes. Records are still yielded in file order. Parsing errors are then
+            handled in the worker processes: with ``OnError.LOG``, they are logged by the workers' loggers, and with
+            ``OnError.RAISE``, the error is raised when the failing chunk is reached, after the records of the chunks
+            before it were yielded. On platforms starting processes with "spawn" (Windows, macOS), the calling script
+            must be guarded by ``if __name__ == "__main__":``.
+        :param keys: When provided, only these keys are kept in every record, records not having
+            some of them are yielded without them. Records that are not objects are handled as errors.
         :return: Generator of *JsonList*
         """
-        with ExitStack() as stack:
-            provider = stack.enter_context(open(_file, "r", encoding="utf8"))
+        kept_keys: tuple[str, ...] | None = None if keys is None else tuple(dict.fromkeys(keys))  # deduplicated, in the caller's order
+
+        if workers > 1:
+            yield from JSON_IO._yield_json_list_from_file_in_parallel(_file, batch_size, on_error_behavior, workers, kept_keys)
+            return
+
+        try_parse_json: Callable[[bytes, OnError], JsonType | None] = JSON_IO._get_line_parser(kept_keys)
 
+        with open(_file, "rb", buffering=_IO_BUFFER_SIZE) as provider:
             chunk: list[JsonType] = []
-            line_number: int = 0
 
             for line in provider:
-                line_number += 1
-
-                if (result := JSON_IO._try_parse_json(line, on_error_behavior)) is not None:
+                if (result := try_parse_json(line, on_error_behavior)) is not None:
                     chunk.append(result)
 
                 if len(chunk) >= batch_size:
@@ -180,6 +316,94 @@ class JSON_IO:
             if chunk:
                 yield chunk
 
+    @staticmethod
+    def _get_line_parser(kept_keys: tuple[str, ...] | None) -> Callable[[bytes, OnError], JsonType | None]:
+        if kept_keys is None:
+            return JSON_IO._try_parse_json
+
+        return partial(JSON_IO._try_parse_projected_json, kept_keys=kept_keys)
+
+    @staticmethod
+    def _try_parse_projected_json(data: bytes, on_error: OnError, kept_keys: tuple[str, ...]) -> JsonType | None:
+        if (record := JSON_IO._try_parse_json(data, on_error)) is None:
+            return None
+
+        if not isinstance(record, dict):
+            handle_error(
+                TypeError(f"Expected a JSON object, got {type(record).__name__}"), on_error, message="Could not keep keys of json from source"
+            )
+            return None
+
+        # Projected right away so the full records never outlive the line they come from
+        return {key: record[key] for key in kept_keys if key in record}
+
+    @staticmethod
+    def _get_ndjson_chunk_boundaries(_file: str, chunk_size: int) -> list[tuple[int, int]]:
+        boundaries: list[tuple[int, int]] = []
+
+        with open(_file, "rb") as f:
+            if not (size := os.fstat(f.fileno()).st_size):
+                return boundaries  # an empty file cannot be mapped
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                start: int = 0
+
+                while start < size:
+                    # Chunks end right after a new line, so no line is ever split between two workers
+                    if (end := mapped.find(b"\n", min(start + chunk_size, size) - 1)) == -1:
+                        end = size
+                    else:
+                        end += 1
+
+                    boundaries.append((start, end))
+                    start = end
+
+        return boundaries
+
+    @staticmethod
+    def _parse_ndjson_chunk(_file: str, start: int, end: int, on_error_behavior: OnError, kept_keys: tuple[str, ...] | None) -> JsonListType:
+        with open(_file, "rb", buffering=0) as f:
+            f.seek(start)
+            lines: list[bytes] = f.read(end - start).split(b"\n")
+
+        try_parse_json: Callable[[bytes, OnError], JsonType | None] = JSON_IO._get_line_parser(kept_keys)
+        return [result for line in lines if (result := try_parse_json(line, on_error_behavior)) is not None]
+
+    @staticmethod
+    def _yield_json_list_from_file_in_parallel(
+        _file: str, batch_size: int, on_error_behavior: OnError, workers: int, kept_keys: tuple[str, ...] | None
+    ) -> Generator[JsonListType, Any, None]:
+        boundaries = iter(JSON_IO._get_ndjson_chunk_boundaries(_file, _PARALLEL_CHUNK_SIZE))
+        chunk: list[JsonType] = []
+
+        executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # At most two chunks per worker are in flight, which bounds memory while keeping every worker busy
+            pending: deque[Future[JsonListType]] = deque()
+
+            for start, end in boundaries:
+                pending.append(executor.submit(JSON_IO._parse_ndjson_chunk, _file, start, end, on_error_behavior, kept_keys))
+                if len(pending) >= 2 * workers:
+                    break
+
+            while pending:
+                records: JsonListType = pending.popleft().result()  # oldest first, so file order is kept
+
+                if (boundary := next(boundaries, None)) is not None:
+                    pending.append(executor.submit(JSON_IO._parse_ndjson_chunk, _file, *boundary, on_error_behavior, kept_keys))
+
+                chunk.extend(records)
+                if (full_length := len(chunk) - len(chunk) % batch_size) > 0:
+                    for index in range(0, full_length, batch_size):
+                        yield chunk[index : index + batch_size]
+                    chunk = chunk[full_length:]
+        finally:
+            # Not waiting: when the consumer stops early, the chunks still queued are dropped instead of being parsed for nothing
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if chunk:
+            yield chunk
+
     @staticmethod
     def yield_json_list_from_csv(_file: str, batch_size: int) -> Generator[JsonListType, Any, None]:
         """
@@ -193,10 +417,20 @@ class JSON_IO:
         """
         buffer: list[JsonType] = []
 
-        with open(_file, "r", encoding="utf8") as csv_file:
-            reader = csv.DictReader(csv_file)
-            for data in reader:
-                data = {key: None if not value else value for (key, value) in data.items()}
+        with open(_file, "r", buffering=_IO_BUFFER_SIZE, encoding="utf8") as csv_file:
+            reader = csv.reader(csv_file)
+            field_names: tuple[str, ...] = tuple(next(reader, ()))
+            field_count: int = len(field_names)
+
+            for row in reader:
+                if not row:
+                    continue
+
+                data: JsonType = dict(zip(field_names, [value or None for value in row]))
+                if len(row) < field_count:  # same as csv.DictReader: missing values are None, extra ones are listed under None
+                    data.update(dict.fromkeys(field_names[len(row) :]))
+                elif len(row) > field_count:
+                    data[None] = row[field_count:]
                 buffer.append(data)
 
                 if len(buffer) >= batch_size:
@@ -208,20 +442,37 @@ class JSON_IO:
 
     @staticmethod
     def _parse_value_from_excel(cell_value: Any) -> Any:
-        if isinstance(cell_value, str):
-            try:
-                if cell_value.lower() in ["false", "true"]:
-                    return cell_value.lower() == "true"
+        if not isinstance(cell_value, str) or not cell_value:
+            return cell_value
+
+        if len(cell_value) <= 5 and (boolean := _EXCEL_BOOLEANS.get(cell_value.lower())) is not None:
+            return boolean
+
+        if cell_value.startswith(("[", "{")) and cell_value.endswith(("]", "}")):
+            return json.loads(cell_value)
+
+        return cell_value
+
+    @staticmethod
+    def _normalize_value_from_calamine(cell_value: Any) -> Any:
+        """
+        Gives calamine's values the types openpyxl gives. openpyxl decides between int and float from the number's text in
+        the file, which calamine does not expose: integral numbers written without an exponent, i.e. below 1e16, are ints.
+        """
+        if isinstance(cell_value, float):
+            return int(cell_value) if cell_value.is_integer() and abs(cell_value) < _EXCEL_LARGEST_INTEGER_TEXT else cell_value
 
-                if cell_value[0] in ["[", "{"] and cell_value[-1] in ["]", "}"]:
-                    return json.loads(cell_value)
-            except IndexError:
-                return cell_value
+        if isinstance(cell_value, date) and not isinstance(cell_value, datetime):
+            return datetime(cell_value.year, cell_value.month, cell_value.day)  # openpyxl reads date-only cells as midnight
 
         return cell_value
 
     @staticmethod
-    def yield_json_list_from_excel(_file: str, batch_size: int) -> Generator[JsonListType, Any, None]:
+    def _parse_value_from_calamine(cell_value: Any) -> Any:
+        return JSON_IO._parse_value_from_excel(JSON_IO._normalize_value_from_calamine(cell_value))
+
+    @staticmethod
+    def yield_json_list_from_excel(_file: str, batch_size: int, use_calamine: bool = False) -> Generator[JsonListType, Any, None]:
         """
         A generator yielding *JsonList* objects from an Excel *file_*.
 
@@ -229,34 +480,46 @@ class JSON_IO:
 
         :param _file: The Excel file
         :param batch_size: The maximum size each list should be
+        :param use_calamine: When true, the file is read with python-calamine (the ``calamine`` extra), which is much
+            faster than openpyxl. Values are converted to the types openpyxl gives, except for integral numbers of 1e16
+            and more (see the README).
         :return: Generator of *JsonList*
         """
-
-        # I could have used pandas, but I did not find a proper way to read excel files as generators...
-        excel_file = load_workbook(
-            filename=_file,
-            read_only=True,
-            keep_vba=False,
-            data_only=True,
-            keep_links=False,
-        )
-
-        first_row: Any = next(excel_file.worksheets[0].rows)
-        field_names: tuple[str, ...] = tuple(str(cell.value) for cell in first_row if cell.value)
+        rows: Iterator[Sequence[Any]]
+        parse_value: Callable[[Any], Any]
+        header_row: Sequence[Any]
+
+        if use_calamine:
+            if CalamineWorkbook is None:
+                raise ImportError("python-calamine is required to read Excel files with use_calamine, install the 'calamine' extra")
+
+            # The sheet is parsed natively, openpyxl parses its XML and builds a cell object per value in Python
+            rows = CalamineWorkbook.from_path(_file).get_sheet_by_index(0).iter_rows()
+            parse_value = JSON_IO._parse_value_from_calamine
+            header_row = [JSON_IO._normalize_value_from_calamine(value) for value in next(rows)]
+        else:
+            # I could have used pandas, but I did not find a proper way to read excel files as generators...
+            excel_file = load_workbook(
+                filename=_file,
+                read_only=True,
+                keep_vba=False,
+                data_only=True,
+                keep_links=False,
+            )
+            rows = excel_file.worksheets[0].iter_rows(values_only=True)
+            parse_value = JSON_IO._parse_value_from_excel
+            header_row = next(rows)
+
+        # Interned once, so every row's keys are the same string objects as other keys with the same name
+        field_names: tuple[str, ...] = tuple(sys.intern(str(value)) for value in header_row if value)
 
         buffer: list[JsonType] = []
 
-        for index, row in enumerate(excel_file.worksheets[0].rows):
-            if index == 0:  # skip header row that contains field names
-                continue
-
-            cells: list[str] = [cell.value for cell in row]
-
+        for cells in rows:
             if not any(cells):
                 continue
 
-            cells = [JSON_IO._parse_value_from_excel(cell) if cell else None for cell in cells]
-            buffer.append(dict(zip(field_names, cells)))
+            buffer.append(dict(zip(field_names, [parse_value(cell) if cell else None for cell in cells])))
 
             if len(buffer) >= batch_size:
                 yield buffer
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from empire_commons.types_ import JsonListType, JsonType
+from operator import itemgetter
+
+from empire_commons.types_ import NULL, JsonListType, JsonType
 
 
 class JSONList:
@@ -24,15 +26,20 @@ class JSONList:
             the resulting JSON object
         :return: A JSON object
         """
+        if not ignore_when_field_is_missing and not remove_field_from_mapped_json and isinstance(json_list, list):
+            # Plain mapping: keys are extracted and the result built without running any bytecode per record
+            return dict(zip(map(itemgetter(field_name), json_list), json_list))
+
         result: JsonType = {}
 
         for record in json_list:
-            try:
-                result[record[field_name]] = record
-                if remove_field_from_mapped_json:
-                    del result[record[field_name]][field_name]
-            except KeyError:
-                if not ignore_when_field_is_missing:
-                    raise
+            if (key := record.get(field_name, NULL)) is NULL:
+                if ignore_when_field_is_missing:
+                    continue
+                raise KeyError(field_name)
+
+            if remove_field_from_mapped_json:
+                del record[field_name]
+            result[key] = record
 
         return result
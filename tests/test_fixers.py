@@ -0,0 +1,31 @@
+import pytest
+
+from ejson.error_handler.fixers import fix_non_escaped_double_quotes
+
+
+@pytest.mark.parametrize(
+    "to_decode, expected",
+    [
+        ('{"a": "x"y"}', '{"a": "x\\"y"}'),
+        ('{"a":"x"y"}', '{"a":"x\\"y"}'),
+        ('{"a": "x"y" }', '{"a": "x\\"y" }'),
+        ('{"a": "x"y", "b": "z"w"}', '{"a": "x\\"y", "b": "z\\"w"}'),
+    ],
+)
+def test_fix_non_escaped_double_quotes_repairs_like_the_regular_expression(to_decode: str, expected: str):
+    assert fix_non_escaped_double_quotes(to_decode) == expected
+
+
+@pytest.mark.parametrize(
+    "to_decode",
+    [
+        '{"a": "x"}',
+        '{"a": "x" }',
+        '{"a": "x" , "b": "q"}',
+        '{"a": "x" "b": 1}',  # missing comma: the quotes close and open strings, they are not to escape
+        '{"a": "x""b": 1}',
+        '{"k": "v" "k2": "v2"}',
+    ],
+)
+def test_fix_non_escaped_double_quotes_leaves_other_quotes_untouched(to_decode: str):
+    assert fix_non_escaped_double_quotes(to_decode) is to_decode
@@ -0,0 +1,42 @@
+import io
+from datetime import date, datetime
+
+import pytest
+
+from ejson.json_io import JSON_IO
+
+
+@pytest.mark.parametrize("handle_type", [io.StringIO, io.BytesIO])
+@pytest.mark.parametrize("valid_record_count", [10, 2000])
+def test_write_ndjson_to_opened_file_keeps_records_before_an_unserializable_one(handle_type: type, valid_record_count: int):
+    json_list = [{"index": index} for index in range(valid_record_count)] + [{"index": object()}] + [{"index": -1}] * 5
+    handle = handle_type()
+
+    assert not JSON_IO.write_ndjson_to_opened_file(handle, json_list)
+
+    written = handle.getvalue()
+    lines = (written.encode("utf-8") if isinstance(written, str) else written).splitlines()
+    assert lines == [f'{{"index":{index}}}'.encode("utf-8") for index in range(valid_record_count)]
+
+
+def test_yield_json_list_from_excel_gives_the_same_values_with_calamine(tmp_path):
+    pytest.importorskip("python_calamine")
+    openpyxl = pytest.importorskip("openpyxl")
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", 2020, "day", "moment", "big", "bigger", "flag", "data", "ratio"])
+    sheet.append(["a", 1, date(2024, 1, 2), datetime(2024, 1, 2, 3, 4, 5), 10**16, 12345678901234567, True, '{"k": 1}', 1.5])
+    sheet.append(["b", 2.0, date(2024, 2, 3), datetime(2024, 2, 3, 4, 5, 6), -(10**16), 1e17, False, "[1, 2]", -0.25])
+    path = str(tmp_path / "sample.xlsx")
+    workbook.save(path)
+
+    with_openpyxl = [record for batch in JSON_IO.yield_json_list_from_excel(path, 2) for record in batch]
+    with_calamine = [record for batch in JSON_IO.yield_json_list_from_excel(path, 2, use_calamine=True) for record in batch]
+
+    assert with_calamine == with_openpyxl
+    assert [{key: type(value) for key, value in record.items()} for record in with_calamine] == [
+        {key: type(value) for key, value in record.items()} for record in with_openpyxl
+    ]
+    assert list(with_calamine[0]) == ["name", "2020", "day", "moment", "big", "bigger", "flag", "data", "ratio"]
+    assert with_calamine[0]["day"] == datetime(2024, 1, 2)